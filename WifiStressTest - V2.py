@@ -12,38 +12,49 @@
   creating real network load so you can test how jittery your video calls get.
 
 Dependencies:
-    pip install requests
+    pip install urllib3
 """
 
+import socket
 import threading
 import tkinter as tk
 from tkinter import ttk, font
 import time
-import requests
+import urllib3
 
 # 10MB test file (from ThinkBroadband). Swap this URL if you want a different file.
 TEST_FILE_URL = "http://ipv4.download.thinkbroadband.com/10MB.zip"
 
+# Socket options for pooled connections: disable Nagle's algorithm
+SOCKET_OPTIONS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+
+# The download is read in chunks of this size and thrown away
+READ_CHUNK_SIZE = 256 * 1024
+
+# The body is thrown away, so ask for it uncompressed and skip decoding
+REQUEST_HEADERS = {"Accept-Encoding": "identity"}
+
 class LagThread(threading.Thread):
     """Thread that keeps downloading a test file to generate network load."""
-    def __init__(self, stop_event: threading.Event, idx: int):
+    def __init__(self, stop_event: threading.Event, idx: int, pool: urllib3.PoolManager):
         super().__init__(daemon=True)
         self.stop_event = stop_event
         self.idx = idx
+        self.pool = pool
 
     def run(self):
-        session = requests.Session()
         while not self.stop_event.is_set():
             try:
-                with session.get(TEST_FILE_URL, stream=True, timeout=10) as resp:
-                    # Read & discard in 64KB chunks
-                    for chunk in resp.iter_content(chunk_size=64 * 1024):
-                        if self.stop_event.is_set():
-                            break
-                        # Just drop the chunk
+                resp = self.pool.urlopen("GET", TEST_FILE_URL, headers=REQUEST_HEADERS, timeout=10,
+                                         preload_content=False, decode_content=False)
+                try:
+                    # Read & discard until the body ends
+                    while not self.stop_event.is_set() and resp.read(READ_CHUNK_SIZE):
                         pass
+                finally:
+                    resp.release_conn()
                 time.sleep(0.05)  # Brief pause before next download
-            except requests.RequestException:
+            except urllib3.exceptions.HTTPError:
                 time.sleep(1)  # If something breaks, wait a sec and retry
 
 class LagGUI:
@@ -61,6 +72,7 @@ class LagGUI:
 
         self.stop_event = None
         self.threads = []
+        self.pool = None
 
         # --- Top Instruction Label ---
         self.intro_label = ttk.Label(
@@ -149,6 +161,10 @@ class LagGUI:
         self.stop_event = threading.Event()
         self.threads = []
 
+        # One pool for all threads, sized so every thread keeps its own keep-alive socket
+        self.pool = urllib3.PoolManager(num_pools=1, maxsize=num_threads, block=True, retries=False,
+                                        socket_options=SOCKET_OPTIONS)
+
         # Update UI to “starting” state
         self.status_var.set(f"Starting {num_threads} lag threads… 🏃💨")
         self.status_label.configure(foreground="orange")
@@ -156,7 +172,7 @@ class LagGUI:
 
         # Spawn threads
         for i in range(num_threads):
-            t = LagThread(self.stop_event, idx=i)
+            t = LagThread(self.stop_event, idx=i, pool=self.pool)
             t.start()
             self.threads.append(t)
             # Update active-count display
@@ -181,9 +197,14 @@ class LagGUI:
         for t in self.threads:
             t.join(timeout=0.1)
 
+        # Close pooled connections
+        if self.pool:
+            self.pool.clear()
+
         # Reset counters & status
         self.threads = []
         self.stop_event = None
+        self.pool = None
         self.active_count_var.set("0")
         self.status_var.set("All done! Wi-Fi is chill again. 😌")
         self.status_label.configure(foreground="green")
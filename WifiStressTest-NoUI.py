@@ -6,16 +6,81 @@ A network performance testing tool for mobile/terminal use
 
 import threading
 import socket
+import ssl
 import time
-import requests
-import concurrent.futures
+import certifi
+import urllib3
 from urllib.parse import urlparse
 import random
 import argparse
 import signal
 import sys
+import statistics
+from collections import deque
 from datetime import datetime
 
+try:
+    import resource
+except ImportError:
+    resource = None  # Not available on Windows
+
+# Workers only run a short request loop, so they don't need the default
+# multi-megabyte thread stack (matters with hundreds of threads)
+WORKER_STACK_SIZE = 512 * 1024
+
+# Set on every pooled connection. TCP_NODELAY sends each small GET right away
+# instead of letting Nagle's algorithm hold it back; urllib3 enables it by
+# default, but passing socket_options replaces that default, so list it here.
+# SO_KEEPALIVE keeps idle pooled connections from being dropped silently
+SOCKET_OPTIONS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+                  (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+# Open files allowed on top of one socket per worker thread
+FILE_LIMIT_HEADROOM = 64
+
+# Number of most recent response times kept for statistics
+RESPONSE_TIME_WINDOW = 100
+
+# URLs each worker draws at once instead of calling random.choice per request
+URL_BATCH_SIZE = 4096
+
+# Response bodies are only drained, never used: ask for them uncompressed and
+# read them in fixed-size chunks without decoding
+REQUEST_HEADERS = {"Accept-Encoding": "identity"}
+READ_CHUNK_SIZE = 64 * 1024
+
+# Workers merge their results into the shared stats after this many requests,
+# or after this long, whichever comes first
+STATS_FLUSH_EVERY = 64
+STATS_FLUSH_INTERVAL_NS = 500_000_000
+
+# Longest the final report waits (in total) for workers to finish their
+# in-flight request once the test is stopped
+WORKER_JOIN_TIMEOUT = 5
+
+# Live statistics line, rewritten in place every update
+LIVE_STATS_FORMAT = ("\r📈 Req: %6d | Err: %4d | Rate: %5.1f/s | Recent: %5.1f/s | "
+                     "Avg: %6.0fms | Min: %6.0fms | Max: %6.0fms | Time: %6.1fs")
+
+def raise_open_file_limit(needed):
+    """Raise the soft open-file limit to `needed` where the OS allows it"""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard != resource.RLIM_INFINITY:
+        needed = min(needed, hard)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (needed, hard))
+        except (ValueError, OSError):
+            pass  # Keep the current limit; extra connections will just fail
+
+def summarize_response_times(times):
+    """Return (average, minimum, maximum) for a sequence of response times"""
+    if not times:
+        return 0, 0, 0
+    return sum(times) / len(times), min(times), max(times)
+
 class WiFiStressTester:
     def __init__(self):
         # Test state variables
@@ -27,9 +92,15 @@ class WiFiStressTester:
         self.request_count = 0
         self.error_count = 0
         self.start_time = None
-        self.response_times = []
+        self.response_times = deque(maxlen=RESPONSE_TIME_WINDOW)
         self.connection_times = []
         
+        # Connection pool shared by all workers (created per test run), and the
+        # SSL context its HTTPS connections share so the certifi CA bundle loads
+        # only once
+        self.pool = None
+        self.ssl_context = ssl.create_default_context(cafile=certifi.where())
+        
         # Test targets (public endpoints that can handle traffic)
         self.test_urls = [
             "http://httpbin.org/bytes/1024",
@@ -66,8 +137,8 @@ class WiFiStressTester:
         self.stop_event.clear()
         self.request_count = 0
         self.error_count = 0
-        self.start_time = time.time()
-        self.response_times = []
+        self.start_time = time.monotonic()
+        self.response_times = deque(maxlen=RESPONSE_TIME_WINDOW)
         self.connection_times = []
         
         # Adjust parameters based on intensity
@@ -97,8 +168,8 @@ class WiFiStressTester:
         
     def duration_timer(self, duration):
         """Stop test after specified duration"""
-        time.sleep(duration)
-        if self.is_running:
+        # Returns early (True) if the test is stopped before the limit
+        if not self.stop_event.wait(duration):
             self.print_status(f"⏰ Duration limit ({duration}s) reached")
             self.stop_test()
     
@@ -110,84 +181,171 @@ class WiFiStressTester:
     def run_stress_test(self, thread_count, delay):
         """Main stress test function"""
         
-        def make_requests():
-            session = requests.Session()
+        # Group URLs by scheme + host; each worker sticks to one group so its
+        # keep-alive connection is always to the host it requests next
+        url_groups = {}
+        for url in self.test_urls:
+            url_groups.setdefault(urlparse(url)[:2], []).append(url)
+        url_groups = list(url_groups.values())
+        host_count = len(url_groups)
+        if thread_count < host_count:
+            # Too few workers to give every host its own; each worker draws from
+            # all URLs instead, so no host goes untested
+            url_groups = [self.test_urls]
+        workers_per_group = -(-thread_count // len(url_groups))  # Round up
+        
+        # Every worker holds a socket open, which can pass the default
+        # 1024 open-file limit on high thread counts
+        raise_open_file_limit(thread_count + FILE_LIMIT_HEADROOM)
+        
+        # Single pool shared by every worker so keep-alive sockets are reused
+        # across threads instead of each thread opening its own connections
+        self.pool = urllib3.PoolManager(num_pools=host_count, maxsize=workers_per_group,
+                                        block=True, retries=False, socket_options=SOCKET_OPTIONS,
+                                        ssl_context=self.ssl_context)
+        
+        # Resolve every URL to its host's connection pool and request path once,
+        # so workers don't re-parse URLs or look up pools on each request
+        target_groups = [[(self.pool.connection_from_url(url), urllib3.util.parse_url(url).request_uri)
+                          for url in group]
+                         for group in url_groups]
+        
+        delay_ns = int(delay * 1_000_000_000)
+        
+        def make_requests(group_targets):
+            targets = []
+            next_request_ns = time.monotonic_ns()
+            
+            # Results collected locally and merged in batches
+            pending_times = []
+            pending_errors = 0
+            flush_at_ns = next_request_ns + STATS_FLUSH_INTERVAL_NS
+            
+            # Look up the functions used on every iteration once, as locals
+            is_stopped = self.stop_event.is_set
+            wait = self.stop_event.wait
+            merge_stats = self.merge_stats
+            monotonic_ns = time.monotonic_ns
+            choices = random.choices
             
-            while not self.stop_event.is_set():
+            while not is_stopped():
                 try:
-                    # Choose random test URL
-                    url = random.choice(self.test_urls)
+                    # Choose random test URL from this worker's pre-drawn batch
+                    if not targets:
+                        targets = choices(group_targets, k=URL_BATCH_SIZE)
+                    host_pool, path = targets.pop()
                     
                     # Measure connection time
-                    start_time = time.time()
+                    request_start_ns = monotonic_ns()
                     
                     # Make request with timeout
-                    response = session.get(url, timeout=5)
+                    response = host_pool.urlopen("GET", path, headers=REQUEST_HEADERS, timeout=5,
+                                                 preload_content=False, decode_content=False)
+                    while response.read(READ_CHUNK_SIZE):
+                        pass
+                    response.release_conn()
                     
-                    # Calculate response time
-                    end_time = time.time()
-                    response_time = (end_time - start_time) * 1000  # Convert to ms
+                    # Calculate response time (includes downloading the whole body)
+                    response_time = (monotonic_ns() - request_start_ns) / 1_000_000  # Convert to ms
                     
-                    with self.stats_lock:
-                        self.request_count += 1
-                        self.response_times.append(response_time)
-                        # Keep only last 100 response times for memory efficiency
-                        if len(self.response_times) > 100:
-                            self.response_times.pop(0)
+                    pending_times.append(response_time)
                     
-                except requests.exceptions.RequestException as e:
-                    with self.stats_lock:
-                        self.error_count += 1
+                except urllib3.exceptions.HTTPError as e:
+                    pending_errors += 1
                         
                 except Exception as e:
-                    with self.stats_lock:
-                        self.error_count += 1
+                    pending_errors += 1
+                    
+                # Take stats_lock once per batch instead of once per request
+                now_ns = monotonic_ns()
+                if len(pending_times) + pending_errors >= STATS_FLUSH_EVERY or now_ns >= flush_at_ns:
+                    merge_stats(pending_times, pending_errors)
+                    pending_times = []
+                    pending_errors = 0
+                    flush_at_ns = now_ns + STATS_FLUSH_INTERVAL_NS
+                    
+                # Pace against a fixed schedule so the delay isn't added on top of
+                # the response time; no sleep call at all when already behind
+                next_request_ns += delay_ns
+                remaining_ns = next_request_ns - now_ns
+                if remaining_ns <= 0:
+                    next_request_ns -= remaining_ns  # Don't burst to catch up
+                else:
+                    # Wakes immediately when the test is stopped
+                    wait(remaining_ns / 1_000_000_000)
                     
-                if not self.stop_event.is_set():
-                    time.sleep(delay)
+            # Merge whatever is left once stopped
+            merge_stats(pending_times, pending_errors)
+        
+        # Shrink the stack for worker threads only
+        try:
+            previous_stack_size = threading.stack_size(WORKER_STACK_SIZE)
+        except (ValueError, RuntimeError):
+            previous_stack_size = None  # Not supported on this platform
         
         # Start worker threads
-        with concurrent.futures.ThreadPoolExecutor(max_workers=thread_count) as executor:
-            futures = [executor.submit(make_requests) for _ in range(thread_count)]
-            
-            # Wait for stop signal
-            while not self.stop_event.is_set():
-                time.sleep(0.1)
-            
-            # Shutdown executor
-            executor.shutdown(wait=False)
+        workers = [threading.Thread(target=make_requests, args=(target_groups[i % len(target_groups)],),
+                                    name=f"worker-{i}", daemon=True)
+                   for i in range(thread_count)]
+        for worker in workers:
+            worker.start()
+        
+        if previous_stack_size is not None:
+            threading.stack_size(previous_stack_size)
+        
+        # Wait for stop signal. The timeout only exists so Ctrl+C still
+        # reaches the signal handler on Windows, where a bare wait() blocks it
+        while not self.stop_event.wait(1):
+            pass
+        
+        # Let workers finish their in-flight request and merge their stats, but
+        # don't let a slow or trickling response hold back the report forever
+        join_deadline = time.monotonic() + WORKER_JOIN_TIMEOUT
+        for worker in workers:
+            worker.join(max(0, join_deadline - time.monotonic()))
+        still_running = sum(worker.is_alive() for worker in workers)
+        if still_running:
+            self.print_status(f"⚠️ {still_running} worker(s) still busy; their last results are not included")
+        
+        # Close pooled connections
+        self.pool.clear()
         
         # Final statistics
         self.print_final_stats()
     
+    def merge_stats(self, response_times, errors):
+        """Add a batch of worker results to the shared statistics"""
+        with self.stats_lock:
+            self.request_count += len(response_times)
+            self.error_count += errors
+            # Bounded deque drops the oldest entries in O(1)
+            self.response_times.extend(response_times)
+    
     def display_stats(self):
         """Display live statistics"""
         last_request_count = 0
         
-        while self.is_running:
-            time.sleep(2)  # Update every 2 seconds
-            
-            if not self.is_running:
-                break
-                
+        # Update every 2 seconds until the test is stopped
+        while not self.stop_event.wait(2):
+            # Snapshot under the lock, reduce outside it so workers aren't held up
             with self.stats_lock:
                 current_requests = self.request_count
                 current_errors = self.error_count
-                avg_response_time = sum(self.response_times) / len(self.response_times) if self.response_times else 0
-                min_response_time = min(self.response_times) if self.response_times else 0
-                max_response_time = max(self.response_times) if self.response_times else 0
+                recent_times = tuple(self.response_times)
             
-            elapsed = time.time() - self.start_time
+            avg_response_time, min_response_time, max_response_time = summarize_response_times(recent_times)
+            
+            elapsed = time.monotonic() - self.start_time
             
             if elapsed > 0:
                 overall_rate = current_requests / elapsed
                 recent_rate = (current_requests - last_request_count) / 2.0  # Rate in last 2 seconds
                 
                 # Clear line and print stats
-                print(f"\r📈 Req: {current_requests:>6} | Err: {current_errors:>4} | "
-                      f"Rate: {overall_rate:>5.1f}/s | Recent: {recent_rate:>5.1f}/s | "
-                      f"Avg: {avg_response_time:>6.0f}ms | Min: {min_response_time:>6.0f}ms | "
-                      f"Max: {max_response_time:>6.0f}ms | Time: {elapsed:>6.1f}s", end="", flush=True)
+                sys.stdout.write(LIVE_STATS_FORMAT % (
+                    current_requests, current_errors, overall_rate, recent_rate,
+                    avg_response_time, min_response_time, max_response_time, elapsed))
+                sys.stdout.flush()
                 
                 last_request_count = current_requests
     
@@ -198,27 +356,26 @@ class WiFiStressTester:
         print("📊 Test Results")
         print("=" * 70)
         
-        elapsed = time.time() - self.start_time
-        success_rate = ((self.request_count - self.error_count) / self.request_count * 100) if self.request_count > 0 else 0
+        # Workers still busy after the join timeout may merge results at any
+        # time, so build the whole report from one snapshot taken under the lock
+        with self.stats_lock:
+            request_count = self.request_count
+            error_count = self.error_count
+            response_times = tuple(self.response_times)
+        
+        elapsed = time.monotonic() - self.start_time
+        success_rate = ((request_count - error_count) / request_count * 100) if request_count > 0 else 0
         
         # Response time statistics
-        if self.response_times:
-            avg_response = sum(self.response_times) / len(self.response_times)
-            min_response = min(self.response_times)
-            max_response = max(self.response_times)
-            # Calculate median
-            sorted_times = sorted(self.response_times)
-            n = len(sorted_times)
-            median_response = sorted_times[n//2] if n % 2 == 1 else (sorted_times[n//2-1] + sorted_times[n//2]) / 2
-        else:
-            avg_response = min_response = max_response = median_response = 0
-        
-        print(f"Total Requests:      {self.request_count}")
-        print(f"Successful:          {self.request_count - self.error_count}")
-        print(f"Errors:              {self.error_count}")
+        avg_response, min_response, max_response = summarize_response_times(response_times)
+        median_response = statistics.median(response_times) if response_times else 0
+        
+        print(f"Total Requests:      {request_count}")
+        print(f"Successful:          {request_count - error_count}")
+        print(f"Errors:              {error_count}")
         print(f"Success Rate:        {success_rate:.1f}%")
         print(f"Duration:            {elapsed:.1f} seconds")
-        print(f"Average Rate:        {self.request_count / elapsed:.1f} requests/second" if elapsed > 0 else "N/A")
+        print(f"Average Rate:        {request_count / elapsed:.1f} requests/second" if elapsed > 0 else "N/A")
         print()
         print("📡 Response Time Statistics:")
         print(f"Average:             {avg_response:.0f} ms")
@@ -227,6 +384,18 @@ class WiFiStressTester:
         print(f"Maximum:             {max_response:.0f} ms")
         print()
 
+# Interactive menu answers mapped to their preset values ('' is the default)
+INTENSITY_PRESETS = {'l': 30, 'light': 30, '': 30,
+                     'm': 50, 'medium': 50,
+                     'h': 80, 'high': 80}
+THREAD_PRESETS = {'f': 5, 'few': 5,
+                  'n': 10, 'normal': 10, '': 10,
+                  'm': 20, 'many': 20}
+DURATION_PRESETS = {'q': 30, 'quick': 30,
+                    's': 60, 'standard': 60, '': 60,
+                    'l': 120, 'long': 120,
+                    'u': None, 'unlimited': None}
+
 def get_user_input():
     """Get test configuration from user interactively"""
     print("🔧 Configure your WiFi stress test:")
@@ -243,14 +412,8 @@ def get_user_input():
             
             choice = input("\nChoose intensity [L/m/h/c]: ").lower().strip()
             
-            if choice in ['l', 'light', '']:
-                intensity = 30
-                break
-            elif choice in ['m', 'medium']:
-                intensity = 50
-                break
-            elif choice in ['h', 'high']:
-                intensity = 80
+            if choice in INTENSITY_PRESETS:
+                intensity = INTENSITY_PRESETS[choice]
                 break
             elif choice in ['c', 'custom']:
                 intensity = int(input("Enter intensity (e.g., 10-100, or higher): "))
@@ -277,14 +440,8 @@ def get_user_input():
             
             choice = input("\nChoose thread count [f/N/m/c]: ").lower().strip()
             
-            if choice in ['f', 'few']:
-                threads = 5
-                break
-            elif choice in ['n', 'normal', '']:
-                threads = 10
-                break
-            elif choice in ['m', 'many']:
-                threads = 20
+            if choice in THREAD_PRESETS:
+                threads = THREAD_PRESETS[choice]
                 break
             elif choice in ['c', 'custom']:
                 threads = int(input("Enter thread count (e.g., 1-1000, or higher): "))
@@ -312,22 +469,14 @@ def get_user_input():
             
             choice = input("\nChoose duration [q/S/l/u/c]: ").lower().strip()
             
-            if choice in ['q', 'quick']:
-                duration = 30
-                break
-            elif choice in ['s', 'standard', '']:
-                duration = 60
-                break
-            elif choice in ['l', 'long']:
-                duration = 120
-                break
-            elif choice in ['u', 'unlimited']:
-                duration = None
+            if choice in DURATION_PRESETS:
+                duration = DURATION_PRESETS[choice]
                 break
             elif choice in ['c', 'custom']:
                 duration = int(input("Enter duration in seconds (e.g., 30-300, or 0 for unlimited): "))
                 if duration == 0:
                     duration = None
+                    break
                 elif duration > 0:
                     break
                 else:
@@ -388,10 +537,11 @@ Use --help to see all command line options, or run without arguments for interac
     
     # Check for required modules
     try:
-        import requests
+        import urllib3
+        import certifi
     except ImportError:
-        print("❌ Error: This tool requires the 'requests' module.")
-        print("📦 Install it with: pip install requests")
+        print("❌ Error: This tool requires the 'urllib3' and 'certifi' modules.")
+        print("📦 Install them with: pip install urllib3 certifi")
         sys.exit(1)
     
     # Create tester instance
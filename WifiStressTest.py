@@ -8,11 +8,61 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
 import socket
+import os
+import sys
+import ssl
 import time
-import requests
+import certifi
+import urllib3
 import concurrent.futures
+import itertools
+import queue
 from urllib.parse import urlparse
-import random
+
+# Options for every pooled socket: no Nagle delay on small GETs, and TCP
+# keep-alive probes so idle pooled connections aren't silently dropped
+SOCKET_OPTIONS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+                  (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+# Bodies are discarded, so they're drained in chunks of this size undecoded
+READ_CHUNK_SIZE = 64 * 1024
+
+# Free-threaded builds (python3.13t and later) run the worker threads in
+# parallel instead of taking turns on the GIL
+GIL_DISABLED = hasattr(sys, "_is_gil_enabled") and not sys._is_gil_enabled()
+
+# Upper limit of the Concurrent Connections setting; without the GIL extra
+# threads keep adding throughput, so allow a few per CPU core
+MAX_CONNECTIONS = max(50, 4 * (os.cpu_count() or 1)) if GIL_DISABLED else 50
+
+# Longest the test waits for keep-alive connections to be opened up front,
+# and how often it checks for a stop meanwhile
+WARM_UP_TIMEOUT = 5
+WARM_UP_POLL = 0.1
+
+# How often the statistics panel is refreshed while a test runs
+STATS_REFRESH_MS = 1000
+
+# Lines kept in the statistics panel; older ones are dropped
+STATS_MAX_LINES = 500
+
+def count_totals(worker_counts):
+    """Sum per-worker [requests, errors] pairs into (requests, errors)"""
+    worker_counts = list(worker_counts)  # Workers may still be registering
+    return sum(c[0] for c in worker_counts), sum(c[1] for c in worker_counts)
+
+class TestRun:
+    """State of one test run, shared by its test thread and the UI poller"""
+    def __init__(self):
+        # Fresh event per run, so workers of a previous run that haven't
+        # exited yet can't be revived by a quick restart
+        self.stop_event = threading.Event()
+        # One [requests, errors] pair per worker, each written only by its own
+        # worker and summed by the UI poller
+        self.worker_counts = []
+        self.start_time = time.monotonic()  # Reset once warm-up is done
+        # Messages from the test thread, written to the panel by refresh_stats
+        self.log_queue = queue.SimpleQueue()
 
 class WiFiStressTester:
     def __init__(self, root):
@@ -23,8 +73,11 @@ class WiFiStressTester:
         
         # Test state variables
         self.is_running = False
-        self.test_threads = []
-        self.stop_event = threading.Event()
+        self.current_run = None
+        self.stats_job = None
+        self.test_thread = None
+        
+        self.log_start_time = time.monotonic()  # Log lines show time since this
         
         # Test targets (public endpoints that can handle traffic)
         self.test_urls = [
@@ -34,6 +87,15 @@ class WiFiStressTester:
             "http://httpbin.org/stream/10"
         ]
         
+        # Single pool shared by every worker and kept across runs, so keep-alive
+        # sockets are reused instead of being torn down after each test
+        hosts = {urlparse(url)[:2] for url in self.test_urls}
+        # One SSL context for all HTTPS connections, so the certifi CA bundle is
+        # loaded once rather than for every new connection
+        self.pool = urllib3.PoolManager(num_pools=len(hosts), maxsize=MAX_CONNECTIONS,
+                                        block=False, retries=False, socket_options=SOCKET_OPTIONS,
+                                        ssl_context=ssl.create_default_context(cafile=certifi.where()))
+        
         self.setup_gui()
         
     def setup_gui(self):
@@ -93,7 +155,7 @@ class WiFiStressTester:
         # Thread count
         ttk.Label(config_frame, text="Concurrent Connections:").grid(row=0, column=0, sticky=tk.W)
         self.thread_var = tk.IntVar(value=10)
-        thread_spinbox = ttk.Spinbox(config_frame, from_=1, to=50, textvariable=self.thread_var, width=10)
+        thread_spinbox = ttk.Spinbox(config_frame, from_=1, to=MAX_CONNECTIONS, textvariable=self.thread_var, width=10)
         thread_spinbox.grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
         
         # Request delay
@@ -131,7 +193,7 @@ class WiFiStressTester:
             
     def start_test(self):
         self.is_running = True
-        self.stop_event.clear()
+        self.current_run = run = TestRun()
         
         # Update UI
         self.start_button.config(text="Running...", state="disabled")
@@ -143,16 +205,22 @@ class WiFiStressTester:
         self.stats_text.config(state="normal")
         self.stats_text.delete(1.0, tk.END)
         self.stats_text.config(state="disabled")
+        self.log_start_time = run.start_time
         
         # Start test thread
-        test_thread = threading.Thread(target=self.run_stress_test, daemon=True)
-        test_thread.start()
+        self.test_thread = threading.Thread(target=self.run_stress_test, args=(run,), daemon=True)
+        self.test_thread.start()
         
         self.log_stats("Test started...")
         
+        # Refresh the statistics panel on a timer instead of from the workers
+        if self.stats_job is not None:
+            self.root.after_cancel(self.stats_job)
+        self.stats_job = self.root.after(STATS_REFRESH_MS, self.refresh_stats)
+        
     def stop_test(self):
         self.is_running = False
-        self.stop_event.set()
+        self.current_run.stop_event.set()
         
         # Update UI
         self.start_button.config(text="Start Test", state="normal")
@@ -165,13 +233,38 @@ class WiFiStressTester:
         
         self.log_stats("Test stopped.")
         
+    def refresh_stats(self):
+        """Log queued messages and live statistics until the test thread is done"""
+        run = self.current_run
+        lines = []
+        while True:
+            try:
+                lines.append(run.log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if self.is_running:
+            request_count, error_count = count_totals(run.worker_counts)
+            elapsed = time.monotonic() - run.start_time
+            rate = request_count / elapsed if elapsed > 0 else 0
+            lines.append(f"Requests: {request_count}, Errors: {error_count}, Rate: {rate:.1f}/s")
+        if lines:
+            self.log_stats(*lines)
+        
+        # Keep polling after a stop so the final summary still gets shown
+        if self.is_running or self.test_thread.is_alive() or not run.log_queue.empty():
+            self.stats_job = self.root.after(STATS_REFRESH_MS, self.refresh_stats)
+        else:
+            self.stats_job = None
+        
     def set_idle_status(self):
         if not self.is_running:
             self.status_label.config(text="Status: Idle")
             self.status_indicator.create_oval(5, 5, 15, 15, fill="gray", outline="")
     
-    def run_stress_test(self):
+    def run_stress_test(self, run):
         """Main stress test function"""
+        stop_event = run.stop_event
+        worker_counts = run.worker_counts
         intensity = self.intensity_var.get()
         thread_count = self.thread_var.get()
         base_delay = self.delay_var.get() / 1000.0  # Convert to seconds
@@ -180,70 +273,124 @@ class WiFiStressTester:
         actual_threads = max(1, int(thread_count * (intensity / 100)))
         actual_delay = base_delay * (100 / intensity)  # Higher intensity = less delay
         
-        self.log_stats(f"Using {actual_threads} threads with {actual_delay:.3f}s delay")
+        target_rate = actual_threads / actual_delay
+        run.log_queue.put_nowait(
+            f"Using {actual_threads} threads with {actual_delay:.3f}s delay "
+            f"(target {target_rate:.1f}/s)")
+        
+        pool = self.pool  # Local name for the worker loop
         
-        request_count = 0
-        error_count = 0
-        start_time = time.time()
+        # Workers report in here once warmed up, then wait for the clock to start
+        warmed_up = []
+        go = threading.Event()
         
-        def make_requests():
-            nonlocal request_count, error_count
-            session = requests.Session()
+        def make_requests(urls):
+            counts = [0, 0]  # Requests, errors
+            worker_counts.append(counts)
             
-            while not self.stop_event.is_set():
+            # Look up each endpoint's host pool (its urlopen method) and path once
+            targets = [(pool.connection_from_url(url).urlopen, urllib3.util.parse_url(url).request_uri)
+                       for url in urls]
+            
+            # Open this worker's own keep-alive connection to each of its hosts
+            # before the clock starts, so the measured rate starts at steady
+            # state instead of ramping through handshakes
+            for urlopen in {urlopen for urlopen, _ in targets}:
+                try:
+                    urlopen("HEAD", "/", timeout=2)
+                except Exception:
+                    pass  # The worker will simply connect on its first request
+            warmed_up.append(True)
+            go.wait()
+            
+            # Look up the methods used on every iteration once, as locals
+            next_target = itertools.cycle(targets).__next__
+            is_stopped = stop_event.is_set
+            wait = stop_event.wait
+            monotonic = time.monotonic
+            deadline = monotonic()
+            
+            while not is_stopped():
                 try:
-                    # Choose random test URL
-                    url = random.choice(self.test_urls)
-                    
                     # Make request with timeout
-                    response = session.get(url, timeout=5)
-                    request_count += 1
-                    
-                    if request_count % 10 == 0:  # Update stats every 10 requests
-                        elapsed = time.time() - start_time
-                        rate = request_count / elapsed if elapsed > 0 else 0
-                        self.root.after(0, lambda: self.log_stats(
-                            f"Requests: {request_count}, Errors: {error_count}, Rate: {rate:.1f}/s"))
+                    urlopen, path = next_target()
+                    response = urlopen("GET", path, timeout=5,
+                                       preload_content=False, decode_content=False)
+                    while response.read(READ_CHUNK_SIZE):
+                        pass
+                    response.release_conn()
+                    counts[0] += 1
                     
                 except Exception as e:
-                    error_count += 1
+                    counts[1] += 1
                     
-                time.sleep(actual_delay)
+                # Sleep until the next slot on a fixed schedule so slow responses
+                # don't push the rate below target; if behind, restart from now
+                deadline += actual_delay
+                now = monotonic()
+                if deadline > now:
+                    wait(deadline - now)  # Returns at once on stop
+                else:
+                    deadline = now
+        
+        # Workers are pinned round-robin to one endpoint each, so a slow endpoint
+        # only paces its own workers. With fewer workers than endpoints each one
+        # rotates through all of them instead (from a different starting point),
+        # so no endpoint goes untested
+        urls = self.test_urls
+        if actual_threads >= len(urls):
+            worker_urls = [(urls[i % len(urls)],) for i in range(actual_threads)]
+        else:
+            worker_urls = [urls[i:] + urls[:i] for i in range(actual_threads)]
         
-        # Start worker threads
-        with concurrent.futures.ThreadPoolExecutor(max_workers=actual_threads) as executor:
-            futures = [executor.submit(make_requests) for _ in range(actual_threads)]
-            
-            # Wait for stop signal
-            while not self.stop_event.is_set():
-                time.sleep(0.1)
-            
-            # Shutdown executor
-            executor.shutdown(wait=False)
+        # Start worker threads. The executor is managed by hand: leaving a
+        # 'with' block would call shutdown(wait=True) and block on the workers
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=actual_threads)
+        futures = [executor.submit(make_requests, assigned) for assigned in worker_urls]
+        
+        # Wait for every worker to warm up, then restart the clock and let them go
+        warm_up_deadline = time.monotonic() + WARM_UP_TIMEOUT
+        while len(warmed_up) < actual_threads and time.monotonic() < warm_up_deadline:
+            # Short waits so a stop during warm-up is noticed promptly
+            if stop_event.wait(WARM_UP_POLL):
+                break
+        run.start_time = start_time = time.monotonic()
+        go.set()
+        
+        # Block until stopped
+        stop_event.wait()
+        
+        # Shutdown executor
+        executor.shutdown(wait=False)
         
         # Final stats
-        elapsed = time.time() - start_time
+        request_count, error_count = count_totals(worker_counts)
+        elapsed = time.monotonic() - start_time
         rate = request_count / elapsed if elapsed > 0 else 0
-        self.root.after(0, lambda: self.log_stats(
-            f"Final: {request_count} requests, {error_count} errors in {elapsed:.1f}s (Rate: {rate:.1f}/s)"))
+        run.log_queue.put_nowait(
+            f"Final: {request_count} requests, {error_count} errors in {elapsed:.1f}s (Rate: {rate:.1f}/s)")
     
-    def log_stats(self, message):
-        """Add message to stats display"""
+    def log_stats(self, *messages):
+        """Add messages to stats display in a single widget update"""
+        elapsed = time.monotonic() - self.log_start_time
+        lines = "".join(f"{elapsed:7.2f}s - {message}\n" for message in messages)
         self.stats_text.config(state="normal")
-        self.stats_text.insert(tk.END, f"{time.strftime('%H:%M:%S')} - {message}\n")
+        self.stats_text.insert(tk.END, lines)
+        self.stats_text.delete("1.0", f"end-{STATS_MAX_LINES + 1}l")
         self.stats_text.see(tk.END)
         self.stats_text.config(state="disabled")
 
 def main():
     # Check for required modules
     try:
-        import requests
+        import urllib3
+        import certifi
     except ImportError:
         root = tk.Tk()
         root.withdraw()
         messagebox.showerror("Missing Module", 
-                           "This tool requires the 'requests' module.\n"
-                           "Install it with: pip install requests")
+                           "This tool requires the 'urllib3' and 'certifi' modules.\n"
+                           "Install them with: pip install urllib3 certifi")
         return
     
     root = tk.Tk()
@@ -253,6 +400,7 @@ def main():
     def on_closing():
         if app.is_running:
             app.stop_test()
+        app.pool.clear()
         root.destroy()
     
     root.protocol("WM_DELETE_WINDOW", on_closing)